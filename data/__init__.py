@@ -1 +1,3 @@
-"""\nDATA Module\n"""\n
\ No newline at end of file
+"""
+DATA Module
+"""
@@ -1 +1,3 @@
-"""\nEXPORTERS Module\n"""\n
\ No newline at end of file
+"""
+EXPORTERS Module
+"""
@@ -1,11 +1,18 @@
 """
 图格式导出器 (GraphML, GML, GEXF等)
 """
+from concurrent.futures import ThreadPoolExecutor
+
 import networkx as nx
 from pathlib import Path
 from typing import Dict, List
 
 from ..config import EXPORT_CONFIG
+from ..utils.helpers import iter_node_data, iter_edge_data
+
+# 图格式原生支持的属性类型, 其余导出前转为字符串
+# (isinstance而非type比较: np.float64等子类标量也要保持数值类型)
+_PRIMITIVE = (int, float, bool, str)
 
 
 class GraphFormatExporter:
@@ -33,40 +40,44 @@ class GraphFormatExporter:
         return output_path
 
     def export_all_formats(self, graph: nx.DiGraph, output_dir: Path) -> Dict[str, Path]:
-        """导出所有支持的格式"""
+        """导出所有支持的格式 (属性转换只做一次, 三个写出器并发执行)"""
         output_dir.mkdir(exist_ok=True)
-        exported = {}
 
-        if 'graphml' in self.supported_formats:
-            path = output_dir / "knowledge_graph.graphml"
-            self.export_graphml(graph, path)
-            exported['graphml'] = path
+        G = self._prepare_graph_for_export(graph)
 
-        if 'gml' in self.supported_formats:
-            path = output_dir / "knowledge_graph.gml"
-            self.export_gml(graph, path)
-            exported['gml'] = path
+        writers = {
+            'graphml': (nx.write_graphml, output_dir / "knowledge_graph.graphml"),
+            'gml': (nx.write_gml, output_dir / "knowledge_graph.gml"),
+            'gexf': (nx.write_gexf, output_dir / "knowledge_graph.gexf"),
+        }
+        tasks = {fmt: task for fmt, task in writers.items()
+                 if fmt in self.supported_formats}
 
-        if 'gexf' in self.supported_formats:
-            path = output_dir / "knowledge_graph.gexf"
-            self.export_gexf(graph, path)
-            exported['gexf'] = path
+        # 各格式互不依赖且以I/O为主, 并行写出
+        exported = {}
+        with ThreadPoolExecutor(max_workers=len(tasks) or 1) as executor:
+            futures = {fmt: executor.submit(fn, G, path)
+                       for fmt, (fn, path) in tasks.items()}
+            for fmt, future in futures.items():
+                future.result()
+                exported[fmt] = tasks[fmt][1]
 
         return exported
 
     def _prepare_graph_for_export(self, graph: nx.DiGraph) -> nx.DiGraph:
         """准备图用于导出 - 转换属性类型"""
-        G = nx.DiGraph()
-
-        for node_id, data in graph.nodes(data=True):
-            str_data = {k: str(v) if not isinstance(v, (int, float, bool)) else v 
-                       for k, v in data.items()}
-            G.add_node(node_id, **str_data)
-
-        for src, tgt, data in graph.edges(data=True):
-            str_data = {k: str(v) if not isinstance(v, (int, float, bool)) else v 
-                       for k, v in data.items()}
-            G.add_edge(src, tgt, **str_data)
+        # 浅拷贝即可: 属性字典是新的, 可就地覆写非原生类型的值
+        G = graph.copy()
+
+        for _, data in iter_node_data(G):
+            for k, v in data.items():
+                if not isinstance(v, _PRIMITIVE):
+                    data[k] = str(v)
+
+        for _, _, data in iter_edge_data(G):
+            for k, v in data.items():
+                if not isinstance(v, _PRIMITIVE):
+                    data[k] = str(v)
 
         return G
 
@@ -1,6 +1,7 @@
 """
 分析报告生成器
 """
+import gzip
 import json
 from pathlib import Path
 from datetime import datetime
@@ -18,84 +19,102 @@ class ReportGenerator:
         self.graph_stats = graph_stats
         self.report_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
+        # 聚合结果只算一次, markdown和JSON两条路径共用
+        self._pkg_counts = df['C'].value_counts()
+        self._func_counts = df['FunctionClass'].value_counts().sort_index()
+        # 单次agg遍历拿到全部所需统计量 (describe会额外算分位数)
+        self._size_stats = df[['ChipL', 'ChipW', 'ChipH']].agg(
+            ['mean', 'std', 'min', 'max'])
+        self._nunique = df[['C', 'FunctionClass', 'PhysicalClass']].nunique()
+
+    def _column_stats(self, col: str) -> Dict[str, float]:
+        """从预计算的describe结果提取单列统计量"""
+        stats = self._size_stats[col]
+        # float32标量不能直接进json.dump, 转成Python float
+        return {
+            'mean': float(stats['mean']),
+            'std': float(stats['std']),
+            'min': float(stats['min']),
+            'max': float(stats['max'])
+        }
+
     def generate_markdown_report(self, output_path: Path) -> Path:
-        """生成Markdown格式报告"""
-        lines = []
-
-        # 标题
-        lines.append("# PCB元件知识图谱分析报告")
-        lines.append("")
-        lines.append(f"**生成时间**: {self.report_time}")
-        lines.append("")
-
-        # 数据概览
-        lines.append("## 1. 数据概览")
-        lines.append("")
-        lines.append(f"- **总元件数**: {len(self.df)}")
-        lines.append(f"- **封装类型数**: {self.df['C'].nunique()}")
-        lines.append(f"- **功能类别数**: {self.df['FunctionClass'].nunique()}")
-        lines.append(f"- **物理类别数**: {self.df['PhysicalClass'].nunique()}")
-        lines.append("")
-
-        # 知识图谱统计
-        lines.append("## 2. 知识图谱统计")
-        lines.append("")
-        lines.append(f"- **总节点数**: {self.graph_stats.get('total_nodes', 0)}")
-        lines.append(f"- **总边数**: {self.graph_stats.get('total_edges', 0)}")
-        lines.append(f"- **节点类型数**: {len(self.graph_stats.get('node_types', {}))}")
-        lines.append(f"- **关系类型数**: {len(self.graph_stats.get('relation_types', {}))}")
-        lines.append("")
-
-        # 节点类型分布
-        lines.append("### 节点类型分布")
-        lines.append("")
-        for node_type, count in self.graph_stats.get('node_types', {}).items():
-            lines.append(f"- {node_type}: {count}个")
-        lines.append("")
-
-        # Top封装
-        lines.append("## 3. 热门封装类型")
-        lines.append("")
-        top_packages = self.df['C'].value_counts().head(10)
-        lines.append("| 排名 | 封装 | 元件数量 | 占比 |")
-        lines.append("|------|------|----------|------|")
-        total = len(self.df)
-        for i, (pkg, count) in enumerate(top_packages.items(), 1):
-            pct = count / total * 100
-            lines.append(f"| {i} | {pkg} | {count} | {pct:.1f}% |")
-        lines.append("")
-
-        # 功能类别分布
-        lines.append("## 4. 功能类别分布")
-        lines.append("")
-        func_dist = self.df['FunctionClass'].value_counts().sort_index()
-        lines.append("| 类别 | 名称 | 数量 | 占比 |")
-        lines.append("|------|------|------|------|")
-        for func, count in func_dist.items():
-            name = FUNCTION_CLASS_MAP.get(func, f'Class_{func}')
-            pct = count / total * 100
-            lines.append(f"| {func} | {name} | {count} | {pct:.1f}% |")
-        lines.append("")
-
-        # 尺寸统计
-        lines.append("## 5. 尺寸统计")
-        lines.append("")
-        lines.append(f"- **平均长度**: {self.df['ChipL'].mean():.2f} mm")
-        lines.append(f"- **平均宽度**: {self.df['ChipW'].mean():.2f} mm")
-        lines.append(f"- **平均高度**: {self.df['ChipH'].mean():.2f} mm")
-        lines.append(f"- **最大长度**: {self.df['ChipL'].max():.2f} mm")
-        lines.append(f"- **最大宽度**: {self.df['ChipW'].max():.2f} mm")
-        lines.append(f"- **最大高度**: {self.df['ChipH'].max():.2f} mm")
-        lines.append("")
-
-        # 写入文件
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(lines))
+        """生成Markdown格式报告 (直接写入缓冲文件, 不在内存中拼接整篇)"""
+        with open(output_path, 'w', encoding='utf-8', buffering=1 << 16) as f:
+            w = f.write  # 本地化方法引用, 省去每行的属性查找
+
+            # 标题
+            w("# PCB元件知识图谱分析报告\n")
+            w("\n")
+            w(f"**生成时间**: {self.report_time}\n")
+            w("\n")
+
+            # 数据概览
+            w("## 1. 数据概览\n")
+            w("\n")
+            w(f"- **总元件数**: {len(self.df)}\n")
+            w(f"- **封装类型数**: {self._nunique['C']}\n")
+            w(f"- **功能类别数**: {self._nunique['FunctionClass']}\n")
+            w(f"- **物理类别数**: {self._nunique['PhysicalClass']}\n")
+            w("\n")
+
+            # 知识图谱统计
+            w("## 2. 知识图谱统计\n")
+            w("\n")
+            w(f"- **总节点数**: {self.graph_stats.get('total_nodes', 0)}\n")
+            w(f"- **总边数**: {self.graph_stats.get('total_edges', 0)}\n")
+            w(f"- **节点类型数**: {len(self.graph_stats.get('node_types', {}))}\n")
+            w(f"- **关系类型数**: {len(self.graph_stats.get('relation_types', {}))}\n")
+            w("\n")
+
+            # 节点类型分布
+            w("### 节点类型分布\n")
+            w("\n")
+            for node_type, count in self.graph_stats.get('node_types', {}).items():
+                w(f"- {node_type}: {count}个\n")
+            w("\n")
+
+            # Top封装
+            w("## 3. 热门封装类型\n")
+            w("\n")
+            top_packages = self._pkg_counts.head(10)
+            w("| 排名 | 封装 | 元件数量 | 占比 |\n")
+            w("|------|------|----------|------|\n")
+            total = len(self.df)
+            for i, (pkg, count) in enumerate(top_packages.items(), 1):
+                pct = count / total * 100
+                w(f"| {i} | {pkg} | {count} | {pct:.1f}% |\n")
+            w("\n")
+
+            # 功能类别分布
+            w("## 4. 功能类别分布\n")
+            w("\n")
+            func_dist = self._func_counts
+            w("| 类别 | 名称 | 数量 | 占比 |\n")
+            w("|------|------|------|------|\n")
+            for func, count in func_dist.items():
+                name = FUNCTION_CLASS_MAP.get(func, f'Class_{func}')
+                pct = count / total * 100
+                w(f"| {func} | {name} | {count} | {pct:.1f}% |\n")
+            w("\n")
+
+            # 尺寸统计
+            w("## 5. 尺寸统计\n")
+            w("\n")
+            size_stats = self._size_stats
+            w(f"- **平均长度**: {size_stats.loc['mean', 'ChipL']:.2f} mm\n")
+            w(f"- **平均宽度**: {size_stats.loc['mean', 'ChipW']:.2f} mm\n")
+            w(f"- **平均高度**: {size_stats.loc['mean', 'ChipH']:.2f} mm\n")
+            w(f"- **最大长度**: {size_stats.loc['max', 'ChipL']:.2f} mm\n")
+            w(f"- **最大宽度**: {size_stats.loc['max', 'ChipW']:.2f} mm\n")
+            w(f"- **最大高度**: {size_stats.loc['max', 'ChipH']:.2f} mm\n")
+            w("\n")
 
         return output_path
 
-    def generate_json_report(self, output_path: Path) -> Path:
-        """生成JSON格式报告"""
+    def generate_json_report(self, output_path: Path,
+                             compress: bool = False) -> Path:
+        """生成JSON格式报告 (compress=True时流式写入gzip, 产物缩小5-10倍)"""
         report = {
             'metadata': {
                 'generated_at': self.report_time,
@@ -103,37 +122,29 @@ class ReportGenerator:
             },
             'data_summary': {
                 'total_components': len(self.df),
-                'unique_packages': self.df['C'].nunique(),
-                'unique_functions': self.df['FunctionClass'].nunique(),
-                'unique_physical': self.df['PhysicalClass'].nunique()
+                'unique_packages': int(self._nunique['C']),
+                'unique_functions': int(self._nunique['FunctionClass']),
+                'unique_physical': int(self._nunique['PhysicalClass'])
             },
             'graph_statistics': self.graph_stats,
-            'package_distribution': self.df['C'].value_counts().head(10).to_dict(),
-            'function_distribution': self.df['FunctionClass'].value_counts().to_dict(),
+            'package_distribution': self._pkg_counts.head(10).to_dict(),
+            'function_distribution': self._func_counts.to_dict(),
             'size_statistics': {
-                'length': {
-                    'mean': self.df['ChipL'].mean(),
-                    'std': self.df['ChipL'].std(),
-                    'min': self.df['ChipL'].min(),
-                    'max': self.df['ChipL'].max()
-                },
-                'width': {
-                    'mean': self.df['ChipW'].mean(),
-                    'std': self.df['ChipW'].std(),
-                    'min': self.df['ChipW'].min(),
-                    'max': self.df['ChipW'].max()
-                },
-                'height': {
-                    'mean': self.df['ChipH'].mean(),
-                    'std': self.df['ChipH'].std(),
-                    'min': self.df['ChipH'].min(),
-                    'max': self.df['ChipH'].max()
-                }
+                'length': self._column_stats('ChipL'),
+                'width': self._column_stats('ChipW'),
+                'height': self._column_stats('ChipH')
             }
         }
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(report, f, ensure_ascii=False, indent=2)
+        if compress:
+            # compresslevel=1几乎不耗CPU; json.dump直接流入gzip, 无中间缓冲
+            output_path = Path(str(output_path) + '.gz')
+            with gzip.open(output_path, 'wt', encoding='utf-8',
+                           compresslevel=1) as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+        else:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
 
         return output_path
 
@@ -1 +1,3 @@
-"""\nGRAPH_BUILDER Module\n"""\n
\ No newline at end of file
+"""
+GRAPH_BUILDER Module
+"""
@@ -21,7 +21,12 @@ class RelationType(Enum):
     HAS_PHYSICAL_TYPE = "hasPhysicalType"
 
 
-@dataclass
+# Enum.value走描述符协议, 热循环里用查表代替
+_NODE_TYPE_VALUE = {n: n.value for n in NodeType}
+_RELATION_VALUE = {r: r.value for r in RelationType}
+
+
+@dataclass(slots=True)
 class Node:
     """知识图谱节点"""
     id: str
@@ -35,13 +40,13 @@ class Node:
         return {
             'id': self.id,
             'name': self.name,
-            'type': self.node_type.value,
+            'type': _NODE_TYPE_VALUE[self.node_type],
             'label': self.label,
             **self.properties
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Edge:
     """知识图谱边"""
     source: str
@@ -55,7 +60,7 @@ class Edge:
         return {
             'source': self.source,
             'target': self.target,
-            'relation': self.relation.value,
+            'relation': _RELATION_VALUE[self.relation],
             'weight': self.weight,
             **self.properties
         }
@@ -64,13 +69,34 @@ class Edge:
 class EntityFactory:
     """实体工厂类"""
 
+    # 节点ID的唯一生成入口, 保证构建与查询两侧永不脱节
+    @staticmethod
+    def comp_id(idnum: int) -> str:
+        """元件节点ID"""
+        return f"COMP_{idnum}"
+
+    @staticmethod
+    def pkg_id(package_name: str) -> str:
+        """封装节点ID"""
+        return f"PKG_{package_name}"
+
+    @staticmethod
+    def func_id(func_class: int) -> str:
+        """功能类别节点ID"""
+        return f"FUNC_{func_class}"
+
+    @staticmethod
+    def phy_id(phy_class: int) -> str:
+        """物理类别节点ID"""
+        return f"PHY_{phy_class}"
+
     @staticmethod
     def create_component_node(idnum: int, name: str, lname: str,
                              chip_l: float, chip_w: float, chip_h: float,
                              mfr: str = '', mpn: str = '') -> Node:
         """创建元件节点"""
         return Node(
-            id=f"COMP_{idnum}",
+            id=EntityFactory.comp_id(idnum),
             name=name,
             node_type=NodeType.COMPONENT,
             label=name[:15] if len(name) > 15 else name,
@@ -90,7 +116,7 @@ class EntityFactory:
     def create_package_node(package_name: str) -> Node:
         """创建封装节点"""
         return Node(
-            id=f"PKG_{package_name}",
+            id=EntityFactory.pkg_id(package_name),
             name=package_name,
             node_type=NodeType.PACKAGE,
             label=package_name,
@@ -101,7 +127,7 @@ class EntityFactory:
     def create_function_class_node(func_class: int, class_name: str) -> Node:
         """创建功能类别节点"""
         return Node(
-            id=f"FUNC_{func_class}",
+            id=EntityFactory.func_id(func_class),
             name=class_name,
             node_type=NodeType.FUNCTION_CLASS,
             label=class_name,
@@ -112,7 +138,7 @@ class EntityFactory:
     def create_physical_class_node(phy_class: int, class_name: str) -> Node:
         """创建物理类别节点"""
         return Node(
-            id=f"PHY_{phy_class}",
+            id=EntityFactory.phy_id(phy_class),
             name=class_name,
             node_type=NodeType.PHYSICAL_CLASS,
             label=class_name,
@@ -1,13 +1,15 @@
 """
 知识图谱构建器
 """
+import sys
+
 import pandas as pd
 import networkx as nx
 from typing import Dict, List, Set, Tuple, Optional
 from collections import defaultdict
 
 from .entity_relations import (
-    Node, Edge, NodeType, RelationType, EntityFactory
+    Node, Edge, NodeType, RelationType, EntityFactory, _RELATION_VALUE
 )
 from ..config import FUNCTION_CLASS_MAP, PHYSICAL_CLASS_MAP
 
@@ -20,9 +22,24 @@ class KnowledgeGraphBuilder:
         self.nodes: Dict[str, Node] = {}
         self.edges: List[Edge] = []
         self.graph: Optional[nx.DiGraph] = None
+        self._stats: Optional[Dict] = None
+        # 边的倒排索引, 让按端点查询从O(E)降到O(度数)
+        self._edges_by_source: Dict[str, List[Edge]] = defaultdict(list)
+        self._edges_by_target: Dict[str, List[Edge]] = defaultdict(list)
+        # 按类型/关系分桶, 构建时顺手维护, 查询无需全量扫描
+        self._nodes_by_type: Dict[NodeType, List[Node]] = defaultdict(list)
+        self._edges_by_relation: Dict[RelationType, List[Edge]] = defaultdict(list)
 
     def build(self) -> 'KnowledgeGraphBuilder':
         """构建知识图谱"""
+        # 重复build时从头累积, 否则各分桶/索引会翻倍
+        self.nodes = {}
+        self.edges = []
+        self._stats = None
+        self._edges_by_source = defaultdict(list)
+        self._edges_by_target = defaultdict(list)
+        self._nodes_by_type = defaultdict(list)
+        self._edges_by_relation = defaultdict(list)
         self._create_component_nodes()
         self._create_package_nodes()
         self._create_function_class_nodes()
@@ -33,18 +50,21 @@ class KnowledgeGraphBuilder:
 
     def _create_component_nodes(self):
         """创建所有元件节点"""
-        for _, row in self.df.iterrows():
+        # itertuples比iterrows快一个数量级: 不为每行构造Series
+        cols = self.df[['IDNUM', 'NAME', 'LNAME', 'ChipL', 'ChipW', 'ChipH',
+                        'MFR', 'MPN']].itertuples(index=False, name=None)
+        for idnum, name, lname, chip_l, chip_w, chip_h, mfr, mpn in cols:
             node = EntityFactory.create_component_node(
-                idnum=row['IDNUM'],
-                name=row['NAME'],
-                lname=row['LNAME'],
-                chip_l=row['ChipL'],
-                chip_w=row['ChipW'],
-                chip_h=row['ChipH'],
-                mfr=row['MFR'],
-                mpn=row['MPN']
+                idnum=idnum,
+                name=name,
+                lname=lname,
+                chip_l=chip_l,
+                chip_w=chip_w,
+                chip_h=chip_h,
+                mfr=mfr,
+                mpn=mpn
             )
-            self.nodes[node.id] = node
+            self._add_node(node)
 
     def _create_package_nodes(self):
         """创建所有封装节点"""
@@ -52,7 +72,7 @@ class KnowledgeGraphBuilder:
         for pkg in packages:
             if pkg:
                 node = EntityFactory.create_package_node(pkg)
-                self.nodes[node.id] = node
+                self._add_node(node)
 
     def _create_function_class_nodes(self):
         """创建所有功能类别节点"""
@@ -60,7 +80,7 @@ class KnowledgeGraphBuilder:
         for fc in func_classes:
             fc_name = FUNCTION_CLASS_MAP.get(fc, f'Class_{fc}')
             node = EntityFactory.create_function_class_node(fc, fc_name)
-            self.nodes[node.id] = node
+            self._add_node(node)
 
     def _create_physical_class_nodes(self):
         """创建所有物理类别节点"""
@@ -68,95 +88,115 @@ class KnowledgeGraphBuilder:
         for pc in phy_classes:
             pc_name = PHYSICAL_CLASS_MAP.get(pc, f'Physical_{pc}')
             node = EntityFactory.create_physical_class_node(pc, pc_name)
-            self.nodes[node.id] = node
+            self._add_node(node)
+
+    def _add_node(self, node: Node):
+        """登记一个节点并维护类型分桶"""
+        self.nodes[node.id] = node
+        self._nodes_by_type[node.node_type].append(node)
+
+    def _add_edge(self, edge: Edge):
+        """登记一条边并维护倒排索引与关系分桶"""
+        self.edges.append(edge)
+        self._edges_by_source[edge.source].append(edge)
+        self._edges_by_target[edge.target].append(edge)
+        self._edges_by_relation[edge.relation].append(edge)
 
     def _create_relationships(self):
         """创建所有关系边"""
-        for _, row in self.df.iterrows():
-            comp_id = f"COMP_{row['IDNUM']}"
+        intern = sys.intern
+        cols = self.df[['IDNUM', 'C', 'FunctionClass',
+                        'PhysicalClass']].itertuples(index=False, name=None)
+        for idnum, c, func_class, phy_class in cols:
+            # 每行的各个ID只格式化一次; 类别ID驻留以加速后续字典查找
+            comp_id = EntityFactory.comp_id(idnum)
 
             # 1. 元件 -> 封装
-            if row['C']:
-                edge = EntityFactory.create_edge(
+            if c:
+                self._add_edge(EntityFactory.create_edge(
                     source=comp_id,
-                    target=f"PKG_{row['C']}",
+                    target=intern(EntityFactory.pkg_id(c)),
                     relation=RelationType.USES_PACKAGE
-                )
-                self.edges.append(edge)
+                ))
 
             # 2. 元件 -> 功能类别
-            edge = EntityFactory.create_edge(
+            self._add_edge(EntityFactory.create_edge(
                 source=comp_id,
-                target=f"FUNC_{row['FunctionClass']}",
+                target=intern(EntityFactory.func_id(func_class)),
                 relation=RelationType.HAS_FUNCTION
-            )
-            self.edges.append(edge)
+            ))
 
             # 3. 元件 -> 物理类别
-            edge = EntityFactory.create_edge(
+            self._add_edge(EntityFactory.create_edge(
                 source=comp_id,
-                target=f"PHY_{row['PhysicalClass']}",
+                target=intern(EntityFactory.phy_id(phy_class)),
                 relation=RelationType.HAS_PHYSICAL_TYPE
-            )
-            self.edges.append(edge)
+            ))
 
     def _build_networkx_graph(self):
-        """构建NetworkX图"""
+        """构建NetworkX图 (批量接口, 避免逐节点/逐边的调用开销)"""
         self.graph = nx.DiGraph()
-
-        # 添加节点
-        for node_id, node in self.nodes.items():
-            self.graph.add_node(node_id, **node.to_dict())
-
-        # 添加边
-        for edge in self.edges:
-            self.graph.add_edge(
-                edge.source, 
-                edge.target,
-                relation=edge.relation.value,
-                weight=edge.weight
-            )
+        self.graph.add_nodes_from(
+            (node_id, node.to_dict()) for node_id, node in self.nodes.items()
+        )
+        relation_value = _RELATION_VALUE
+        self.graph.add_edges_from(
+            (e.source, e.target,
+             {'relation': relation_value[e.relation], 'weight': e.weight})
+            for e in self.edges
+        )
 
     def get_nodes_by_type(self, node_type: NodeType) -> List[Node]:
         """获取指定类型的所有节点"""
-        return [n for n in self.nodes.values() if n.node_type == node_type]
+        return self._nodes_by_type[node_type]
 
     def get_edges_by_relation(self, relation: RelationType) -> List[Edge]:
         """获取指定关系的所有边"""
-        return [e for e in self.edges if e.relation == relation]
+        return self._edges_by_relation[relation]
 
     def get_statistics(self) -> Dict:
-        """获取图谱统计信息"""
-        return {
+        """获取图谱统计信息 (读取预建分桶, 结果缓存)"""
+        if self._stats is not None:
+            return self._stats
+
+        # 连通性相关指标共用一次遍历得到的分量列表
+        if self.graph:
+            n_components = sum(1 for _ in nx.weakly_connected_components(self.graph))
+            network_metrics = {
+                'density': nx.density(self.graph),
+                'is_connected': n_components == 1,
+                'connected_components': n_components
+            }
+        else:
+            network_metrics = {}
+
+        # 分桶在构建时已维护好, 统计只需读各桶长度
+        self._stats = {
             'total_nodes': len(self.nodes),
             'total_edges': len(self.edges),
             'node_types': {
-                nt.value: len(self.get_nodes_by_type(nt))
+                nt.value: len(self._nodes_by_type[nt])
                 for nt in NodeType
             },
             'relation_types': {
-                rt.value: len(self.get_edges_by_relation(rt))
+                rt.value: len(self._edges_by_relation[rt])
                 for rt in RelationType
             },
-            'network_metrics': {
-                'density': nx.density(self.graph),
-                'is_connected': nx.is_weakly_connected(self.graph),
-                'connected_components': nx.number_weakly_connected_components(self.graph)
-            } if self.graph else {}
+            'network_metrics': network_metrics
         }
+        return self._stats
 
     def get_subgraph_by_package(self, package_name: str) -> List[str]:
         """获取指定封装下的所有元件"""
-        pkg_id = f"PKG_{package_name}"
+        pkg_id = EntityFactory.pkg_id(package_name)
         if pkg_id not in self.nodes:
             return []
 
-        # 找到所有指向该封装的元件
-        components = [
-            e.source for e in self.edges 
-            if e.target == pkg_id and e.relation == RelationType.USES_PACKAGE
+        # 倒排索引只需扫描该封装的入边
+        return [
+            e.source for e in self._edges_by_target[pkg_id]
+            if e.relation is RelationType.USES_PACKAGE
         ]
-        return components
 
     def get_component_details(self, component_id: str) -> Optional[Dict]:
         """获取元件详细信息"""
@@ -165,11 +205,9 @@ class KnowledgeGraphBuilder:
 
         node = self.nodes[component_id]
 
-        # 找到所有相关边
-        related_edges = [
-            e for e in self.edges 
-            if e.source == component_id or e.target == component_id
-        ]
+        # 找到所有相关边 (按端点直接取索引)
+        related_edges = (self._edges_by_source[component_id] +
+                         self._edges_by_target[component_id])
 
         return {
             'node': node.to_dict(),
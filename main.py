@@ -7,20 +7,22 @@ from pathlib import Path
 # 添加项目路径
 sys.path.insert(0, str(Path(__file__).parent))
 
+from concurrent.futures import ThreadPoolExecutor
+
 from config import INPUT_FILE, OUTPUT_DIR
 from parsers.pcb_parser import PCBParser
 from graph_builder.knowledge_graph import KnowledgeGraphBuilder
 from visualization.graph_visualizer import GraphVisualizer, HierarchicalLayout
-from visualization.charts import ChartGenerator
-from exporters.csv_exporter import CSVExporter
-from exporters.graphml_exporter import GraphFormatExporter
-from exporters.report_generator import ReportGenerator
+from visualization.charts import generate_charts
+from exporters.csv_exporter import export_to_csv
+from exporters.graphml_exporter import export_graph_formats
+from exporters.report_generator import generate_report
 from utils.helpers import ProgressLogger
 
 
 def main():
     """主流程"""
-    logger = ProgressLogger(total_steps=7)
+    logger = ProgressLogger(total_steps=4)
 
     # 1. 解析PCB数据
     logger.log("解析PCB JSON数据...")
@@ -37,7 +39,7 @@ def main():
     stats = builder.get_statistics()
     logger.success(f"图谱构建完成: {stats['total_nodes']}节点, {stats['total_edges']}边")
 
-    # 3. 可视化知识图谱
+    # 3. 可视化知识图谱 (matplotlib主图保持在主线程)
     logger.log("生成知识图谱可视化...")
     visualizer = GraphVisualizer(graph)
     layout = HierarchicalLayout(graph)
@@ -49,30 +51,22 @@ def main():
     )
     logger.success("图谱可视化已保存")
 
-    # 4. 生成分析图表
-    logger.log("生成数据分析图表...")
-    chart_gen = ChartGenerator(df)
-    chart_gen.generate_all_charts(OUTPUT_DIR)
-    logger.success("分析图表已生成")
-
-    # 5. 导出CSV数据
-    logger.log("导出CSV格式数据...")
-    csv_exporter = CSVExporter()
-    csv_files = csv_exporter.export_from_graph(graph, OUTPUT_DIR)
-    logger.success(f"CSV导出完成: {len(csv_files)}个文件")
-
-    # 6. 导出图格式
-    logger.log("导出图格式数据...")
-    graph_exporter = GraphFormatExporter()
-    graph_files = graph_exporter.export_all_formats(graph, OUTPUT_DIR)
-    logger.success(f"图格式导出完成: {len(graph_files)}个文件")
+    # 4. 图表/CSV/图格式/报告互不依赖, 并行执行
+    logger.log("并行生成分析图表与导出数据...")
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        chart_future = executor.submit(generate_charts, df, OUTPUT_DIR)
+        csv_future = executor.submit(export_to_csv, graph, OUTPUT_DIR)
+        graph_future = executor.submit(export_graph_formats, graph, OUTPUT_DIR)
+        report_future = executor.submit(generate_report, df, stats, OUTPUT_DIR)
 
-    # 7. 生成报告
-    logger.log("生成分析报告...")
-    report_gen = ReportGenerator(df, stats)
-    report_gen.generate_markdown_report(OUTPUT_DIR / "report.md")
-    report_gen.generate_json_report(OUTPUT_DIR / "report.json")
-    logger.success("分析报告已生成")
+        chart_future.result()
+        logger.success("分析图表已生成")
+        csv_files = csv_future.result()
+        logger.success(f"CSV导出完成: {len(csv_files)}个文件")
+        graph_files = graph_future.result()
+        logger.success(f"图格式导出完成: {len(graph_files)}个文件")
+        report_future.result()
+        logger.success("分析报告已生成")
 
     # 完成
     logger.success("所有任务完成!")
@@ -1 +1,3 @@
-"""\nPARSERS Module\n"""\n
\ No newline at end of file
+"""
+PARSERS Module
+"""
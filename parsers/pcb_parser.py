@@ -8,6 +8,39 @@ from pathlib import Path
 from ..utils.helpers import load_json, get_function_class_name, get_physical_class_name
 from ..config import FUNCTION_CLASS_MAP, PHYSICAL_CLASS_MAP
 
+# 嵌套JSON字段 -> DataFrame列名映射
+COLUMN_MAP = {
+    'IDNUM': 'IDNUM',
+    'NAME': 'NAME',
+    'LNAME': 'LNAME',
+    'General.PhysicalClass': 'PhysicalClass',
+    'General.FunctionClass': 'FunctionClass',
+    'General.C': 'C',
+    'General.MFR': 'MFR',
+    'General.MPN': 'MPN',
+    'Shape.Outline.ChipL': 'ChipL',
+    'Shape.Outline.ChipW': 'ChipW',
+    'Shape.Outline.ChipH': 'ChipH',
+    'Supply.Feeder.NR': 'NR',
+}
+
+# 数值列及其目标类型 (提前声明, 避免二次类型推断;
+# 尺寸列保持float64, 导出和报表里的数值才与源数据逐位一致)
+NUMERIC_DTYPES = {
+    'IDNUM': 'int64',
+    'PhysicalClass': 'int64',
+    'FunctionClass': 'int64',
+    'ChipL': 'float64',
+    'ChipW': 'float64',
+    'ChipH': 'float64',
+    'NR': 'int64',
+}
+
+STRING_COLS = ['NAME', 'LNAME', 'C', 'MFR', 'MPN']
+
+# 低基数列转category: value_counts/nunique从O(N)哈希降为O(类别数)
+CATEGORY_COLS = ('C', 'FunctionClass', 'PhysicalClass')
+
 
 class PCBParser:
     """PCB数据解析器"""
@@ -19,58 +52,49 @@ class PCBParser:
         self.df = None
 
     def parse(self) -> 'PCBParser':
-        """解析JSON文件"""
+        """解析JSON文件并向量化提取元件数据"""
         self.raw_data = load_json(self.filepath)
         self.parts = self.raw_data.get('Part', [])
+        self.df = self._build_dataframe()
         return self
 
-    def extract_entities(self) -> List[Dict[str, Any]]:
-        """提取实体信息"""
-        entities = []
-
-        for part in self.parts:
-            entity = self._extract_part_data(part)
-            if entity:
-                entities.append(entity)
-
-        return entities
-
-    def _extract_part_data(self, part: Dict) -> Optional[Dict[str, Any]]:
-        """提取单个元件数据"""
-        try:
-            general = part.get('General', {})
-            shape = part.get('Shape', {})
-            outline = shape.get('Outline', {})
-            smt = part.get('SMT', {})
-            supply = part.get('Supply', {})
-
-            # 安全获取Feeder数据
-            feeder_data = supply.get('Feeder', {})
-
-            return {
-                'IDNUM': part.get('IDNUM'),
-                'NAME': part.get('NAME', ''),
-                'LNAME': part.get('LNAME', ''),
-                'PhysicalClass': general.get('PhysicalClass'),
-                'FunctionClass': general.get('FunctionClass'),
-                'C': general.get('C', ''),  # 封装类型
-                'MFR': general.get('MFR', ''),
-                'MPN': general.get('MPN', ''),
-                'ChipL': outline.get('ChipL', 0),
-                'ChipW': outline.get('ChipW', 0),
-                'ChipH': outline.get('ChipH', 0),
-                'Nozzle': ','.join(smt.get('Nozzle', [])),
-                'NR': feeder_data.get('NR', 0) if isinstance(feeder_data, dict) else 0
-            }
-        except Exception as e:
-            print(f"解析元件 {part.get('IDNUM', 'unknown')} 时出错: {e}")
-            return None
+    def _build_dataframe(self) -> pd.DataFrame:
+        """一次性展平所有元件为DataFrame (单次C级遍历, 无逐行Python循环)"""
+        flat = pd.json_normalize(self.parts, sep='.')
+
+        # 选择并重命名需要的列 (缺失的列补空)
+        df = flat.reindex(columns=list(COLUMN_MAP)).rename(columns=COLUMN_MAP)
+
+        # Nozzle为字符串列表, 向量化拼接
+        if 'SMT.Nozzle' in flat.columns:
+            df['Nozzle'] = flat['SMT.Nozzle'].map(
+                lambda v: ','.join(v) if isinstance(v, list) else ''
+            )
+        else:
+            df['Nozzle'] = ''
+
+        # 统一填充缺失值并声明类型
+        df[STRING_COLS] = df[STRING_COLS].fillna('')
+        num_cols = list(NUMERIC_DTYPES)
+        df[num_cols] = df[num_cols].fillna(0)
+        df = df.astype(NUMERIC_DTYPES)
+
+        # ID列收窄到能容纳取值的最小整型
+        for col in ('IDNUM', 'NR'):
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+
+        # 低基数列转category
+        for col in CATEGORY_COLS:
+            df[col] = df[col].astype('category')
+
+        # 列顺序与历史版本保持一致
+        return df[['IDNUM', 'NAME', 'LNAME', 'PhysicalClass', 'FunctionClass',
+                   'C', 'MFR', 'MPN', 'ChipL', 'ChipW', 'ChipH', 'Nozzle', 'NR']]
 
     def to_dataframe(self) -> pd.DataFrame:
         """转换为DataFrame"""
         if self.df is None:
-            entities = self.extract_entities()
-            self.df = pd.DataFrame(entities)
+            self.parse()
         return self.df
 
     def get_statistics(self) -> Dict[str, Any]:
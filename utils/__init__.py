@@ -1 +1,3 @@
-"""\nUTILS Module\n"""\n
\ No newline at end of file
+"""
+UTILS Module
+"""
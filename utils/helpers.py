@@ -5,19 +5,51 @@ import json
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 
+try:
+    import orjson  # C实现, 大文件解析快2-4倍
+except ImportError:
+    orjson = None
+
 
 def load_json(filepath: Path) -> Dict[str, Any]:
     """加载JSON文件"""
+    if orjson is not None:
+        return orjson.loads(Path(filepath).read_bytes())
     with open(filepath, 'r', encoding='utf-8') as f:
         return json.load(f)
 
 
 def save_json(data: Dict[str, Any], filepath: Path, indent: int = 2) -> None:
     """保存JSON文件"""
+    if orjson is not None and indent == 2:
+        options = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        Path(filepath).write_bytes(orjson.dumps(data, option=options))
+        return
     with open(filepath, 'w', encoding='utf-8') as f:
         json.dump(data, f, ensure_ascii=False, indent=indent)
 
 
+def iter_node_data(graph):
+    """遍历图的(节点, 属性)对
+
+    直接读NetworkX内部的_node字典, 跳过NodeDataView逐项包装;
+    属性名多版本稳定, 仍保留公共API兜底。
+    """
+    if hasattr(graph, '_node'):
+        return graph._node.items()
+    return graph.nodes(data=True)
+
+
+def iter_edge_data(graph):
+    """遍历图的(源, 目标, 属性)三元组, 同样绕过视图包装"""
+    if hasattr(graph, '_adj'):
+        for src, nbrs in graph._adj.items():
+            for tgt, data in nbrs.items():
+                yield src, tgt, data
+    else:
+        yield from graph.edges(data=True)
+
+
 def truncate_string(s: str, max_length: int, suffix: str = '...') -> str:
     """截断字符串"""
     if len(s) <= max_length:
@@ -1 +1,3 @@
-"""\nVISUALIZATION Module\n"""\n
\ No newline at end of file
+"""
+VISUALIZATION Module
+"""
@@ -1,6 +1,10 @@
 """
 数据分析图表生成器
 """
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import numpy as np
@@ -10,54 +14,77 @@ from pathlib import Path
 
 from ..config import FUNCTION_CLASS_MAP, VIS_CONFIG, OUTPUT_DIR
 
+# 图表方法与输出文件的对应关系, 渲染任务按此分发
+_CHART_METHODS = [
+    ('plot_package_distribution', "chart_package_distribution.png"),
+    ('plot_function_pie', "chart_function_pie.png"),
+    ('plot_size_scatter', "chart_size_scatter.png"),
+    ('plot_height_distribution', "chart_height_distribution.png"),
+    ('plot_analysis_dashboard', "chart_analysis_dashboard.png"),
+]
+
+
+def _render_chart(args):
+    """子进程渲染入口: 重建生成器并画一张图"""
+    df, method_name, output_path = args
+    matplotlib.use('Agg')  # 子进程一律走无界面后端
+    generator = ChartGenerator(df)
+    getattr(generator, method_name)(output_path)
+    return output_path
+
 
 class ChartGenerator:
     """图表生成器"""
 
     def __init__(self, df: pd.DataFrame):
         self.df = df
+        # category编码让groupby按哈希好的类别码分组, 而不是逐值哈希
+        for col in ('FunctionClass', 'C'):
+            if self.df[col].dtype.name != 'category':
+                self.df = self.df.assign(**{col: self.df[col].astype('category')})
+        # 尺寸列降为float32, 后续散点/直方图搬运的数据量减半
+        for col in ('ChipL', 'ChipW', 'ChipH'):
+            if self.df[col].dtype.name != 'float32':
+                self.df = self.df.assign(**{col: self.df[col].astype('float32')})
         self.bgcolor = '#0d1117'
         self.panel_color = '#161b22'
         self.edge_color = '#30363d'
 
-    def generate_all_charts(self, output_dir: Path) -> List[Path]:
-        """生成所有分析图表"""
-        generated_files = []
+        # 多张图共用的聚合结果只算一次
+        self._pkg_counts = self.df['C'].value_counts()
+        self._func_counts = self.df['FunctionClass'].value_counts().sort_index()
+        self._func_names_full = [FUNCTION_CLASS_MAP.get(f, f'Class_{f}')
+                                 for f in self._func_counts.index]
+        self._func_names_short = [n[:8] for n in self._func_names_full]
+        self._heights = self.df['ChipH'].to_numpy()
+        self._h_mean = self._heights.mean()
+        self._h_median = np.median(self._heights)
+        self._hist30 = np.histogram(self._heights, bins=30)
 
-        # 1. 封装分布图
-        path = output_dir / "chart_package_distribution.png"
-        self.plot_package_distribution(path)
-        generated_files.append(path)
+        # 五张图顺序渲染时共用一个Figure, 省掉反复建删画布的开销
+        self._fig = plt.figure(figsize=(16, 12))
 
-        # 2. 功能类别饼图
-        path = output_dir / "chart_function_pie.png"
-        self.plot_function_pie(path)
-        generated_files.append(path)
+    def __del__(self):
+        plt.close(self._fig)
 
-        # 3. 尺寸散点图
-        path = output_dir / "chart_size_scatter.png"
-        self.plot_size_scatter(path)
-        generated_files.append(path)
-
-        # 4. 高度分布图
-        path = output_dir / "chart_height_distribution.png"
-        self.plot_height_distribution(path)
-        generated_files.append(path)
-
-        # 5. 综合分析面板
-        path = output_dir / "chart_analysis_dashboard.png"
-        self.plot_analysis_dashboard(path)
-        generated_files.append(path)
-
-        return generated_files
+    def generate_all_charts(self, output_dir: Path) -> List[Path]:
+        """生成所有分析图表 (每张图一个进程, 渲染和PNG编码并行)"""
+        tasks = [(self.df, method_name, output_dir / filename)
+                 for method_name, filename in _CHART_METHODS]
+        max_workers = min(len(tasks), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(_render_chart, tasks))
 
     def plot_package_distribution(self, output_path: Path, top_n: int = 15):
         """绘制封装类型分布图"""
-        fig, ax = plt.subplots(figsize=(12, 8))
+        fig = self._fig
+        fig.clear()
+        fig.set_size_inches(12, 8)
+        ax = fig.add_subplot()
         ax.set_facecolor(self.panel_color)
         fig.patch.set_facecolor(self.bgcolor)
 
-        top_packages = self.df['C'].value_counts().head(top_n)
+        top_packages = self._pkg_counts.head(top_n)
         bars = ax.barh(range(len(top_packages)), top_packages.values, 
                       color='#5d9cec', alpha=0.8, edgecolor='white', linewidth=0.5)
 
@@ -74,19 +101,20 @@ class ChartGenerator:
             ax.text(val + 0.5, i, str(val), va='center', color='white', fontsize=9)
 
         self._style_axis(ax)
-        plt.tight_layout()
-        plt.savefig(output_path, dpi=150, facecolor=self.bgcolor, 
-                   bbox_inches='tight')
-        plt.close()
+        fig.tight_layout()
+        self._savefig(output_path)
 
     def plot_function_pie(self, output_path: Path):
         """绘制功能类别饼图"""
-        fig, ax = plt.subplots(figsize=(10, 8))
+        fig = self._fig
+        fig.clear()
+        fig.set_size_inches(10, 8)
+        ax = fig.add_subplot()
         ax.set_facecolor(self.panel_color)
         fig.patch.set_facecolor(self.bgcolor)
 
-        func_counts = self.df['FunctionClass'].value_counts().sort_index()
-        func_names = [FUNCTION_CLASS_MAP.get(f, f'Class_{f}') for f in func_counts.index]
+        func_counts = self._func_counts
+        func_names = self._func_names_full
         colors = ['#e74c3c', '#3498db', '#2ecc71', '#f39c12', '#9b59b6', '#1abc9c']
 
         wedges, texts, autotexts = ax.pie(
@@ -101,14 +129,15 @@ class ChartGenerator:
         ax.set_title('功能类别分布', color='white', fontsize=14, 
                     fontweight='bold', pad=15)
 
-        plt.tight_layout()
-        plt.savefig(output_path, dpi=150, facecolor=self.bgcolor, 
-                   bbox_inches='tight')
-        plt.close()
+        fig.tight_layout()
+        self._savefig(output_path)
 
     def plot_size_scatter(self, output_path: Path):
         """绘制尺寸散点图"""
-        fig, ax = plt.subplots(figsize=(10, 8))
+        fig = self._fig
+        fig.clear()
+        fig.set_size_inches(10, 8)
+        ax = fig.add_subplot()
         ax.set_facecolor(self.panel_color)
         fig.patch.set_facecolor(self.bgcolor)
 
@@ -117,12 +146,13 @@ class ChartGenerator:
             11: '#f39c12', 12: '#9b59b6', 14: '#1abc9c'
         }
 
-        for func_class in self.df['FunctionClass'].unique():
-            subset = self.df[self.df['FunctionClass'] == func_class]
+        # 单次groupby代替逐类别的布尔掩码全表扫描
+        groups = self.df.groupby('FunctionClass', sort=False, observed=True)
+        for func_class, subset in groups:
             label = FUNCTION_CLASS_MAP.get(func_class, f'Class_{func_class}')
-            ax.scatter(subset['ChipL'], subset['ChipW'], 
-                      c=func_colors.get(func_class, '#95a5a6'), 
-                      label=label, alpha=0.7, s=80, 
+            ax.scatter(subset['ChipL'].to_numpy(), subset['ChipW'].to_numpy(),
+                      c=func_colors.get(func_class, '#95a5a6'),
+                      label=label, alpha=0.7, s=80,
                       edgecolors='white', linewidth=1)
 
         ax.set_xlabel('长度 (mm)', color='white', fontsize=12)
@@ -136,25 +166,27 @@ class ChartGenerator:
         ax.set_xlim(0, 15)
         ax.set_ylim(0, 15)
 
-        plt.tight_layout()
-        plt.savefig(output_path, dpi=150, facecolor=self.bgcolor, 
-                   bbox_inches='tight')
-        plt.close()
+        fig.tight_layout()
+        self._savefig(output_path)
 
     def plot_height_distribution(self, output_path: Path):
         """绘制高度分布直方图"""
-        fig, ax = plt.subplots(figsize=(10, 6))
+        fig = self._fig
+        fig.clear()
+        fig.set_size_inches(10, 6)
+        ax = fig.add_subplot()
         ax.set_facecolor(self.panel_color)
         fig.patch.set_facecolor(self.bgcolor)
 
-        heights = self.df['ChipH']
-        n, bins, patches = ax.hist(heights, bins=30, color='#08d9d6', 
-                                  alpha=0.7, edgecolor='white', linewidth=1)
+        # 直方图在__init__里已统计好, 这里只负责画矩形
+        counts, edges = self._hist30
+        ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge',
+              color='#08d9d6', alpha=0.7, edgecolor='white', linewidth=1)
 
-        ax.axvline(heights.mean(), color='#ff2e63', linestyle='--', 
-                  linewidth=2.5, label=f'平均值: {heights.mean():.2f}mm')
-        ax.axvline(heights.median(), color='#f39c12', linestyle=':', 
-                  linewidth=2.5, label=f'中位数: {heights.median():.2f}mm')
+        ax.axvline(self._h_mean, color='#ff2e63', linestyle='--',
+                  linewidth=2.5, label=f'平均值: {self._h_mean:.2f}mm')
+        ax.axvline(self._h_median, color='#f39c12', linestyle=':',
+                  linewidth=2.5, label=f'中位数: {self._h_median:.2f}mm')
 
         ax.set_xlabel('高度 (mm)', color='white', fontsize=12)
         ax.set_ylabel('元件数量', color='white', fontsize=12)
@@ -165,20 +197,21 @@ class ChartGenerator:
 
         self._style_axis(ax)
 
-        plt.tight_layout()
-        plt.savefig(output_path, dpi=150, facecolor=self.bgcolor, 
-                   bbox_inches='tight')
-        plt.close()
+        fig.tight_layout()
+        self._savefig(output_path)
 
     def plot_analysis_dashboard(self, output_path: Path):
         """绘制综合分析面板"""
-        fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+        fig = self._fig
+        fig.clear()
+        fig.set_size_inches(16, 12)
+        axes = fig.subplots(2, 2)
         fig.patch.set_facecolor(self.bgcolor)
 
         # 1. Top封装
         ax1 = axes[0, 0]
         ax1.set_facecolor(self.panel_color)
-        top_packages = self.df['C'].value_counts().head(10)
+        top_packages = self._pkg_counts.head(10)
         bars = ax1.barh(range(len(top_packages)), top_packages.values, color='#5d9cec')
         ax1.set_yticks(range(len(top_packages)))
         ax1.set_yticklabels(top_packages.index, color='white')
@@ -189,9 +222,9 @@ class ChartGenerator:
         # 2. 功能分布
         ax2 = axes[0, 1]
         ax2.set_facecolor(self.panel_color)
-        func_counts = self.df['FunctionClass'].value_counts().sort_index()
+        func_counts = self._func_counts
         colors = ['#e74c3c', '#3498db', '#2ecc71', '#f39c12', '#9b59b6', '#1abc9c']
-        func_names = [FUNCTION_CLASS_MAP.get(f, f'Class_{f}')[:8] for f in func_counts.index]
+        func_names = self._func_names_short
         ax2.pie(func_counts.values, labels=func_names, autopct='%1.0f%%',
                colors=colors, textprops={'color': 'white', 'fontsize': 9})
         ax2.set_title('功能类别', color='white', fontsize=12, fontweight='bold')
@@ -201,10 +234,12 @@ class ChartGenerator:
         ax3.set_facecolor(self.panel_color)
         func_colors = {1: '#e74c3c', 2: '#3498db', 7: '#2ecc71', 
                       11: '#f39c12', 12: '#9b59b6', 14: '#1abc9c'}
-        for func_class in self.df['FunctionClass'].unique()[:6]:
-            subset = self.df[self.df['FunctionClass'] == func_class]
-            ax3.scatter(subset['ChipL'], subset['ChipW'], 
-                       c=func_colors.get(func_class, '#95a5a6'), 
+        groups = self.df.groupby('FunctionClass', sort=False, observed=True)
+        for i, (func_class, subset) in enumerate(groups):
+            if i >= 6:
+                break
+            ax3.scatter(subset['ChipL'].to_numpy(), subset['ChipW'].to_numpy(),
+                       c=func_colors.get(func_class, '#95a5a6'),
                        alpha=0.6, s=50, edgecolors='white', linewidth=0.5)
         ax3.set_xlabel('长度 (mm)', color='white')
         ax3.set_ylabel('宽度 (mm)', color='white')
@@ -214,10 +249,11 @@ class ChartGenerator:
         # 4. 高度分布
         ax4 = axes[1, 1]
         ax4.set_facecolor(self.panel_color)
-        ax4.hist(self.df['ChipH'], bins=25, color='#08d9d6', alpha=0.7, 
-                edgecolor='white')
-        ax4.axvline(self.df['ChipH'].mean(), color='#ff2e63', linestyle='--', 
-                   linewidth=2, label=f'均值: {self.df["ChipH"].mean():.2f}mm')
+        counts, edges = self._hist30
+        ax4.bar(edges[:-1], counts, width=np.diff(edges), align='edge',
+               color='#08d9d6', alpha=0.7, edgecolor='white')
+        ax4.axvline(self._h_mean, color='#ff2e63', linestyle='--',
+                   linewidth=2, label=f'均值: {self._h_mean:.2f}mm')
         ax4.set_xlabel('高度 (mm)', color='white')
         ax4.set_ylabel('数量', color='white')
         ax4.set_title('高度分布', color='white', fontsize=12, fontweight='bold')
@@ -227,10 +263,14 @@ class ChartGenerator:
         fig.suptitle('PCB元件数据分析面板', fontsize=18, color='white', 
                     fontweight='bold', y=0.98)
 
-        plt.tight_layout(rect=[0, 0, 1, 0.95])
-        plt.savefig(output_path, dpi=150, facecolor=self.bgcolor, 
-                   bbox_inches='tight')
-        plt.close()
+        fig.tight_layout(rect=[0, 0, 1, 0.95])
+        self._savefig(output_path)
+
+    def _savefig(self, output_path: Path):
+        """统一保存PNG (固定低压缩级别, 跳过libpng的滤波启发式)"""
+        self._fig.savefig(output_path, dpi=150, facecolor=self.bgcolor,
+                         bbox_inches='tight',
+                         pil_kwargs={'compress_level': 3, 'optimize': False})
 
     def _style_axis(self, ax):
         """统一样式设置"""
@@ -3,15 +3,31 @@
 """
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
+from matplotlib.collections import LineCollection, PatchCollection
 import networkx as nx
 import numpy as np
 from typing import Dict, List, Tuple, Optional
 from pathlib import Path
+from collections import defaultdict
 
 from .layout_engines import LayoutEngine, HierarchicalLayout
 from ..config import VIS_CONFIG, OUTPUT_DIR
 from ..graph_builder.entity_relations import NodeType, RelationType
 
+# 画布的固定数据坐标范围, 绘制和标签裁剪共用
+_XLIM = (-10, 8)
+_YLIM = (-12, 14)
+
+# 全局渲染参数只在模块导入时设置一次:
+# 中文字体之外, 打开路径简化并分块送入Agg, 加速长折线的栅格化
+plt.rcParams.update({
+    'font.sans-serif': ['SimHei', 'DejaVu Sans'],
+    'axes.unicode_minus': False,
+    'path.simplify': True,
+    'path.simplify_threshold': 1.0,
+    'agg.path.chunksize': 10000,
+})
+
 
 class GraphVisualizer:
     """知识图谱可视化器"""
@@ -20,14 +36,24 @@ class GraphVisualizer:
         self.graph = graph
         self.positions: Dict[str, Tuple[float, float]] = {}
         self.config = VIS_CONFIG
-
-        # 设置中文字体
-        plt.rcParams['font.sans-serif'] = ['SimHei', 'DejaVu Sans']
-        plt.rcParams['axes.unicode_minus'] = False
+        self._visible_edges_cache: Optional[List[Tuple[str, str, Dict]]] = None
+        # 坐标的SoA副本: 批量绘制直接按下标取连续数组, 不走dict
+        self._pos_ids: List[str] = []
+        self._pos_xs = np.empty(0, dtype=np.float32)
+        self._pos_ys = np.empty(0, dtype=np.float32)
+        self._id_to_idx: Dict[str, int] = {}
 
     def set_layout(self, layout_engine: LayoutEngine) -> 'GraphVisualizer':
         """设置布局引擎"""
         self.positions = layout_engine.calculate_layout()
+        self._visible_edges_cache = None  # 布局变了, 可见边要重算
+        n = len(self.positions)
+        self._pos_ids = list(self.positions)
+        self._pos_xs = np.fromiter(
+            (p[0] for p in self.positions.values()), dtype=np.float32, count=n)
+        self._pos_ys = np.fromiter(
+            (p[1] for p in self.positions.values()), dtype=np.float32, count=n)
+        self._id_to_idx = {node_id: i for i, node_id in enumerate(self._pos_ids)}
         return self
 
     def visualize(self, 
@@ -42,8 +68,8 @@ class GraphVisualizer:
         ax.set_facecolor(self.config['bgcolor'])
         fig.patch.set_facecolor(self.config['bgcolor'])
 
-        # 过滤可见的边
-        visible_edges = self._get_visible_edges()
+        # 过滤可见的边 (统计面板复用同一份结果, 边表只扫一遍)
+        visible_edges = self._visible_edges_cache = self._get_visible_edges()
 
         # 绘制边
         self._draw_edges(ax, visible_edges)
@@ -55,8 +81,8 @@ class GraphVisualizer:
         self._draw_layer_labels(ax)
 
         # 设置坐标轴
-        ax.set_xlim(-10, 8)
-        ax.set_ylim(-12, 14)
+        ax.set_xlim(*_XLIM)
+        ax.set_ylim(*_YLIM)
         ax.axis('off')
 
         # 添加标题
@@ -73,59 +99,99 @@ class GraphVisualizer:
 
         # 保存
         if output_path:
-            plt.savefig(output_path, dpi=self.config['dpi'], 
-                       facecolor=self.config['bgcolor'], 
-                       edgecolor='none', bbox_inches='tight')
+            plt.savefig(output_path, dpi=self.config['dpi'],
+                       facecolor=self.config['bgcolor'],
+                       edgecolor='none', bbox_inches='tight',
+                       pil_kwargs={'compress_level': 3, 'optimize': False})
             print(f"✓ 图谱已保存: {output_path}")
 
         return fig
 
     def _get_visible_edges(self) -> List[Tuple[str, str, Dict]]:
         """获取可见的边"""
-        visible = []
-        for edge in self.graph.edges(data=True):
-            if edge[0] in self.positions and edge[1] in self.positions:
-                visible.append(edge)
-        return visible
+        has_pos = self.positions.__contains__
+        return [edge for edge in self.graph.edges(data=True)
+                if has_pos(edge[0]) and has_pos(edge[1])]
 
     def _draw_edges(self, ax, edges: List[Tuple[str, str, Dict]]):
-        """绘制边"""
-        for src, tgt, data in edges:
-            x1, y1 = self.positions[src]
-            x2, y2 = self.positions[tgt]
-
-            # 根据关系类型着色
-            relation = data.get('relation', '')
-            color = self.config['edge_colors'].get(relation, '#aaaaaa')
+        """绘制边 (按颜色分桶, 每种关系一条LineCollection)"""
+        idx = self._id_to_idx
+        xs, ys = self._pos_xs, self._pos_ys
+        edge_colors = self.config['edge_colors']
 
-            ax.plot([x1, x2], [y1, y2], color=color, alpha=0.25, 
-                   linewidth=1.2, zorder=1)
+        # 按关系颜色把端点下标对归桶
+        buckets = defaultdict(list)
+        for src, tgt, data in edges:
+            color = edge_colors.get(data.get('relation', ''), '#aaaaaa')
+            buckets[color].append((idx[src], idx[tgt]))
+
+        # 每桶一个LineCollection; 线段坐标从SoA数组整批取出
+        for color, pairs in buckets.items():
+            pair_idx = np.asarray(pairs, dtype=np.intp)
+            segments = np.empty((len(pairs), 2, 2), dtype=np.float32)
+            segments[:, 0, 0] = xs[pair_idx[:, 0]]
+            segments[:, 0, 1] = ys[pair_idx[:, 0]]
+            segments[:, 1, 0] = xs[pair_idx[:, 1]]
+            segments[:, 1, 1] = ys[pair_idx[:, 1]]
+            ax.add_collection(LineCollection(
+                segments, colors=color, alpha=0.25, linewidths=1.2, zorder=1))
 
     def _draw_nodes(self, ax):
-        """绘制节点"""
+        """绘制节点 (Circle补丁归集成三个PatchCollection批量添加)"""
+        node_colors = self.config['node_colors']
+        node_sizes = self.config['node_sizes']
+        font_sizes = self.config['font_size']
+        # 类型只有四种, 每类的(三层半径, 颜色, 字号)预先合成一个条目,
+        # 循环里一次查表, sqrt也只按类型算一遍
+        styles = {}
+        for t in node_colors:
+            size = node_sizes.get(t, 300)
+            styles[t] = (np.sqrt(size) / 25, np.sqrt(size) / 30,
+                         np.sqrt(size) / 35, node_colors[t],
+                         font_sizes.get(t, 8))
+        default_style = (np.sqrt(300) / 25, np.sqrt(300) / 30,
+                         np.sqrt(300) / 35, '#ffffff', 8)
+        graph_nodes = self.graph.nodes
+
+        # 一次遍历收集所有节点的补丁和标签参数
+        xs, ys, labels, fontsizes = [], [], [], []
+        glow_outer, glow_inner, cores = [], [], []
         for node_id, (x, y) in self.positions.items():
-            node_data = self.graph.nodes[node_id]
-            node_type = node_data.get('type', '')
-            color = self.config['node_colors'].get(node_type, '#ffffff')
-            size = self.config['node_sizes'].get(node_type, 300)
-            fontsize = self.config['font_size'].get(node_type, 8)
-
-            # 绘制发光效果
-            for r, alpha in [(np.sqrt(size)/25, 0.2), (np.sqrt(size)/30, 0.4)]:
-                circle = plt.Circle((x, y), r, color=color, alpha=alpha, zorder=2)
-                ax.add_patch(circle)
-
-            # 绘制主节点
-            circle = plt.Circle((x, y), np.sqrt(size)/35, color=color, 
-                              alpha=0.95, zorder=3, edgecolor='white', linewidth=2)
-            ax.add_patch(circle)
-
-            # 添加标签
+            node_data = graph_nodes[node_id]
+            r1, r2, r3, color, fontsize = styles.get(
+                node_data.get('type', ''), default_style)
+            xs.append(x)
+            ys.append(y)
+            fontsizes.append(fontsize)
+
+            # 发光效果: 两层放大的低透明度圆 + 主节点
+            glow_outer.append(plt.Circle((x, y), r1, color=color, alpha=0.2))
+            glow_inner.append(plt.Circle((x, y), r2, color=color, alpha=0.4))
+            cores.append(plt.Circle((x, y), r3, facecolor=color,
+                                    edgecolor=color, alpha=0.95, linewidth=2))
+
             label = node_data.get('label', '')
             if len(label) > 15:
                 label = label[:12] + '...'
-
-            ax.text(x, y, label, ha='center', va='center', 
+            labels.append(label)
+
+        # 每层一个PatchCollection, 而不是逐个add_patch
+        ax.add_collection(PatchCollection(glow_outer, match_original=True,
+                                          zorder=2))
+        ax.add_collection(PatchCollection(glow_inner, match_original=True,
+                                          zorder=2))
+        ax.add_collection(PatchCollection(cores, match_original=True,
+                                          zorder=3))
+
+        # 标签仍需逐个text (matplotlib没有批量文本API);
+        # 空标签和输出时高度不足4像素的标签直接不画.
+        # 注意不能按坐标范围裁剪: 文本不随坐标轴剪裁,
+        # 视野外的标签也会画进bbox_inches='tight'的成品图里
+        min_fontsize = 4 * 72 / self.config['dpi']
+        for x, y, label, fontsize in zip(xs, ys, labels, fontsizes):
+            if not label or fontsize < min_fontsize:
+                continue
+            ax.text(x, y, label, ha='center', va='center',
                    fontsize=fontsize, color='white', fontweight='bold', zorder=4)
 
     def _draw_layer_labels(self, ax):
@@ -186,7 +252,9 @@ class GraphVisualizer:
         """计算统计信息"""
         total_nodes = len(self.graph.nodes())
         visible_nodes = len(self.positions)
-        visible_edges = len(self._get_visible_edges())
+        if self._visible_edges_cache is None:
+            self._visible_edges_cache = self._get_visible_edges()
+        visible_edges = len(self._visible_edges_cache)
 
         type_counts = {}
         for node_id, data in self.graph.nodes(data=True):
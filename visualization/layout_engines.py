@@ -8,6 +8,49 @@ from collections import defaultdict
 
 from ..graph_builder.entity_relations import NodeType
 
+# 类型字符串 -> 枚举的反查表, 省掉逐节点的枚举构造
+_TYPE_BY_VALUE = {t.value: t for t in NodeType}
+
+try:
+    from numba import njit  # LLVM编译数值内核, 循环自动向量化
+except ImportError:
+    njit = None
+
+if njit is not None:
+    @njit(cache=True)
+    def _circle_coords(n, radius, start_angle):
+        """圆周坐标计算的编译内核"""
+        xs = np.empty(n)
+        ys = np.empty(n)
+        for i in range(n):
+            a = start_angle + 2 * np.pi * i / n
+            xs[i] = radius * np.cos(a)
+            ys[i] = radius * np.sin(a)
+        return xs, ys
+else:
+    def _circle_coords(n, radius, start_angle):
+        """圆周坐标计算 (无Numba时的numpy向量化实现)"""
+        angles = start_angle + 2 * np.pi * np.arange(n) / n
+        return radius * np.cos(angles), radius * np.sin(angles)
+
+if njit is not None:
+    @njit(cache=True)
+    def _bulk_positions(order, size, spacing, xs, base_y):
+        """分层布局坐标的融合内核: 一次循环算完整批节点的(x, y)"""
+        n = order.shape[0]
+        out = np.empty((n, 2), dtype=np.float32)
+        for i in range(n):
+            out[i, 0] = xs[i]
+            out[i, 1] = base_y[i] + (order[i] - size[i] / 2 + 0.5) * spacing[i]
+        return out
+else:
+    def _bulk_positions(order, size, spacing, xs, base_y):
+        """分层布局坐标计算 (无Numba时的numpy向量化实现)"""
+        out = np.empty((order.shape[0], 2), dtype=np.float32)
+        out[:, 0] = xs
+        out[:, 1] = base_y + (order - size / 2 + 0.5) * spacing
+        return out
+
 
 class LayoutEngine:
     """布局引擎基类"""
@@ -15,6 +58,16 @@ class LayoutEngine:
     def __init__(self, graph: nx.DiGraph):
         self.graph = graph
         self.positions: Dict[str, Tuple[float, float]] = {}
+        self._node_types: Optional[Dict[str, str]] = None
+
+    def get_node_types(self) -> Dict[str, str]:
+        """节点ID -> 类型字符串的缓存 (按属性逐节点查NetworkX很慢)"""
+        if self._node_types is None:
+            self._node_types = {
+                node_id: data.get('type')
+                for node_id, data in self.graph.nodes(data=True)
+            }
+        return self._node_types
 
     def calculate_layout(self) -> Dict[str, Tuple[float, float]]:
         """计算布局 - 子类实现"""
@@ -47,82 +100,122 @@ class HierarchicalLayout(LayoutEngine):
         pkg_nodes_sorted = self._sort_by_connection_count(pkg_nodes)
         self._place_layer(pkg_nodes_sorted, 0, 1.8)
 
-        # 第3层: 元件 (只显示部分)
-        comp_nodes = self._select_representative_components(nodes_by_type[NodeType.COMPONENT])
-        self._place_components_by_package(comp_nodes, 5)
+        # 第3层: 元件 (只显示部分); 元件->封装映射只建一次, 两个步骤共用
+        comp_to_pkg = self._build_comp_pkg_map()
+        comp_nodes = self._select_representative_components(
+            nodes_by_type[NodeType.COMPONENT], comp_to_pkg=comp_to_pkg)
+        self._place_components_by_package(comp_nodes, 5, comp_to_pkg)
 
         return self.positions
 
     def _group_nodes_by_type(self) -> Dict[NodeType, List[str]]:
         """按类型分组节点"""
         groups = defaultdict(list)
-        for node_id, data in self.graph.nodes(data=True):
-            node_type = NodeType(data.get('type'))
-            groups[node_type].append(node_id)
+        lookup = _TYPE_BY_VALUE.get
+        for node_id, type_value in self.get_node_types().items():
+            node_type = lookup(type_value)
+            if node_type is not None:
+                groups[node_type].append(node_id)
         return groups
 
+    def _build_comp_pkg_map(self) -> Dict[str, str]:
+        """一次遍历边表得到元件 -> 封装的映射"""
+        node_types = self.get_node_types()
+        pkg_value = NodeType.PACKAGE.value
+        comp_to_pkg = {}
+        for src, tgt in self.graph.edges():
+            if node_types.get(tgt) == pkg_value and src not in comp_to_pkg:
+                comp_to_pkg[src] = tgt
+        return comp_to_pkg
+
     def _place_layer(self, nodes: List[str], x: float, spacing: float):
-        """放置单层节点"""
+        """放置单层节点 (整层坐标交给融合内核一次算完)"""
         nodes_sorted = sorted(nodes)
         n = len(nodes_sorted)
-        for i, node in enumerate(nodes_sorted):
-            y = (i - n / 2 + 0.5) * spacing
-            self.positions[node] = (x, y)
+        if n == 0:
+            return
+        out = _bulk_positions(
+            np.arange(n, dtype=np.float32),
+            np.full(n, n, dtype=np.float32),
+            np.full(n, spacing, dtype=np.float32),
+            np.full(n, x, dtype=np.float32),
+            np.zeros(n, dtype=np.float32))
+        self.positions.update(
+            (node, (float(px), float(py)))
+            for node, (px, py) in zip(nodes_sorted, out))
 
     def _sort_by_connection_count(self, nodes: List[str]) -> List[str]:
         """按连接数排序节点"""
-        counts = {}
-        for node in nodes:
-            counts[node] = self.graph.in_degree(node) + self.graph.out_degree(node)
-        return sorted(nodes, key=lambda x: counts[x], reverse=True)
-
-    def _select_representative_components(self, all_components: List[str], 
-                                         max_components: int = 80) -> List[str]:
+        # degree视图一次遍历即得出入度之和; __getitem__作key省掉lambda
+        deg = dict(self.graph.degree(nodes))
+        return sorted(nodes, key=deg.__getitem__, reverse=True)
+
+    def _select_representative_components(self, all_components: List[str],
+                                         max_components: int = 80,
+                                         comp_to_pkg: Optional[Dict[str, str]] = None
+                                         ) -> List[str]:
         """选择代表性元件（每个封装最多2个）"""
-        selected = set()
-        pkg_components = defaultdict(list)
+        if comp_to_pkg is None:
+            comp_to_pkg = self._build_comp_pkg_map()
 
-        # 按封装分组
+        # 倒排索引: 封装 -> 元件列表
+        pkg_components = defaultdict(list)
         for comp in all_components:
-            for neighbor in self.graph.neighbors(comp):
-                neighbor_data = self.graph.nodes[neighbor]
-                if neighbor_data.get('type') == NodeType.PACKAGE.value:
-                    pkg_components[neighbor].append(comp)
-                    break
-
-        # 每个封装选择最多2个
-        for pkg, comps in pkg_components.items():
-            selected.update(comps[:2])
+            pkg = comp_to_pkg.get(comp)
+            if pkg is not None:
+                pkg_components[pkg].append(comp)
+
+        # 按封装连接数从高到低取, 每个封装最多2个, 选满即止
+        selected = []
+        for pkg in self._sort_by_connection_count(list(pkg_components)):
+            selected.extend(pkg_components[pkg][:2])
             if len(selected) >= max_components:
                 break
 
-        return sorted(list(selected))[:max_components]
+        # extend可能在最后一个封装上越过上限, 截断保住显示数量契约
+        return sorted(selected)[:max_components]
 
-    def _place_components_by_package(self, components: List[str], x: float):
+    def _place_components_by_package(self, components: List[str], x: float,
+                                     comp_to_pkg: Optional[Dict[str, str]] = None):
         """根据所属封装放置元件"""
+        if comp_to_pkg is None:
+            comp_to_pkg = self._build_comp_pkg_map()
+
         pkg_y_positions = {}
 
         for comp in components:
-            # 找到所属的封装
-            pkg = None
-            for neighbor in self.graph.neighbors(comp):
-                neighbor_data = self.graph.nodes[neighbor]
-                if neighbor_data.get('type') == NodeType.PACKAGE.value:
-                    pkg = neighbor
-                    break
-
+            pkg = comp_to_pkg.get(comp)
             if pkg and pkg in self.positions:
                 pkg_y = self.positions[pkg][1]
                 if pkg not in pkg_y_positions:
                     pkg_y_positions[pkg] = []
                 pkg_y_positions[pkg].append(comp)
 
-        # 分配位置
+        # 分配位置: 全部封装簇拼成一个批次, 坐标由融合内核一趟算出
+        comps_flat: List[str] = []
+        orders: List[int] = []
+        sizes: List[int] = []
+        base_ys: List[float] = []
         for pkg, comps in pkg_y_positions.items():
             pkg_y = self.positions[pkg][1]
-            for i, comp in enumerate(comps):
-                y = pkg_y + (i - len(comps) / 2 + 0.5) * 0.6
-                self.positions[comp] = (x, y)
+            n = len(comps)
+            comps_flat.extend(comps)
+            orders.extend(range(n))
+            sizes.extend([n] * n)
+            base_ys.extend([pkg_y] * n)
+
+        if not comps_flat:
+            return
+        m = len(comps_flat)
+        out = _bulk_positions(
+            np.asarray(orders, dtype=np.float32),
+            np.asarray(sizes, dtype=np.float32),
+            np.full(m, 0.6, dtype=np.float32),
+            np.full(m, x, dtype=np.float32),
+            np.asarray(base_ys, dtype=np.float32))
+        self.positions.update(
+            (comp, (float(px), float(py)))
+            for comp, (px, py) in zip(comps_flat, out))
 
 
 class SpringLayout(LayoutEngine):
@@ -143,22 +236,24 @@ class SpringLayout(LayoutEngine):
         )
 
         # 调整布局 - 让类别节点分布在四周
-        for node_id, (x, y) in pos.items():
-            node_type = self.graph.nodes[node_id].get('type')
-
-            if node_type == NodeType.PHYSICAL_CLASS.value:
-                # 物理类别放左侧
-                self.positions[node_id] = (x * 0.5 - 4, y * 3)
-            elif node_type == NodeType.FUNCTION_CLASS.value:
-                # 功能类别放右侧
-                self.positions[node_id] = (x * 0.5 + 4, y * 2)
-            elif node_type == NodeType.PACKAGE.value:
-                # 封装放中间
-                self.positions[node_id] = (x * 2, y * 1.5)
-            else:
-                # 元件放内层
-                self.positions[node_id] = (x * 3, y * 1.2)
-
+        # 坐标堆成(N, 2)数组, 按类型掩码整批做仿射变换, 免去逐节点Python循环
+        ids = list(pos)
+        coords = np.array([pos[node_id] for node_id in ids], dtype=np.float32)
+        node_types = self.get_node_types()
+        types = np.array([node_types.get(node_id) for node_id in ids])
+
+        m_phys = types == NodeType.PHYSICAL_CLASS.value
+        m_func = types == NodeType.FUNCTION_CLASS.value
+        m_pkg = types == NodeType.PACKAGE.value
+        m_comp = ~(m_phys | m_func | m_pkg)
+
+        # 物理类别放左侧, 功能类别放右侧, 封装放中间, 元件放内层
+        coords[m_phys] = coords[m_phys] * [0.5, 3.0] + [-4, 0]
+        coords[m_func] = coords[m_func] * [0.5, 2.0] + [4, 0]
+        coords[m_pkg] = coords[m_pkg] * [2.0, 1.5]
+        coords[m_comp] = coords[m_comp] * [3.0, 1.2]
+
+        self.positions = dict(zip(ids, map(tuple, coords.tolist())))
         return self.positions
 
 
@@ -195,12 +290,11 @@ class RadialLayout(LayoutEngine):
         self.positions = pos
         return pos
 
-    def _place_in_circle(self, nodes: List[str], radius: float, 
+    def _place_in_circle(self, nodes: List[str], radius: float,
                         start_angle: float, pos: Dict):
-        """在圆周上放置节点"""
+        """在圆周上放置节点 (三角函数整批计算)"""
         n = len(nodes)
-        for i, node in enumerate(nodes):
-            angle = start_angle + 2 * np.pi * i / n
-            x = radius * np.cos(angle)
-            y = radius * np.sin(angle)
-            pos[node] = (x, y)
+        if n == 0:
+            return
+        xs, ys = _circle_coords(n, radius, start_angle)
+        pos.update(zip(nodes, zip(xs.tolist(), ys.tolist())))